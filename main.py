@@ -4,50 +4,337 @@ This module defines a FastAPI application that serves the agent over HTTP.  It
 uses the Agent Development Kit's `get_fast_api_app` helper to wrap the agent
 into an API.  When deployed on GKE or other hosting environments, uvicorn
 invokes this module to start the server.
+
+Importing this module is cheap: `app` is built on first access, and the ADK
+stack is only imported once the app starts serving.
 """
 
+import asyncio
+import functools
+import logging
 import os
+from contextlib import AsyncExitStack, asynccontextmanager
+from pathlib import Path
 
-import uvicorn
+import orjson
 from fastapi import FastAPI
-from google.adk.cli.fast_api import get_fast_api_app
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, request_response
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.routing import Route
 
+logger = logging.getLogger(__name__)
 
 # Determine the directory that contains this file.  Point the ADK at the
 # directory that CONTAINS the agent packages (e.g. this file's folder), not at
 # a specific agent package. The ADK scans immediate subdirectories for
-# packages that expose `root_agent` in `<package>/agent.py`.
-AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
+# packages that expose `root_agent` in `<package>/agent.py`.  `__file__` is
+# already absolute however this module is loaded (script, import string or
+# Uvicorn worker), so there is no need for abspath's getcwd().
+AGENT_DIR = str(Path(__file__).parent)
+
+# Set SINGLE_AGENT to the name of the one agent package this image serves
+# (e.g. "spanner_agent") to point the ADK straight at it.  The ADK then runs
+# in single-agent mode instead of walking AGENT_DIR up to five levels deep on
+# every app listing; the agent keeps its name in the API.
+SINGLE_AGENT = os.environ.get("SINGLE_AGENT")
+if SINGLE_AGENT:
+    AGENTS_DIR = os.path.join(AGENT_DIR, SINGLE_AGENT)
+else:
+    AGENTS_DIR = AGENT_DIR
 
-# Use SQLite for session persistence. Store the DB under /tmp because the root
-# filesystem is read-only in Kubernetes (readOnlyRootFilesystem: true), while
-# /tmp is mounted as a writable emptyDir volume in the Deployment.
+# Use SQLite for session persistence.  The root filesystem is read-only in
+# Kubernetes (readOnlyRootFilesystem: true), so the Deployment mounts a
+# RAM-backed emptyDir (medium: Memory) at /session.  Sessions are pod-local
+# and lost on restart either way, so keeping the DB in tmpfs turns every fsync
+# into a memcpy.  Outside Kubernetes we fall back to /tmp.
 # You can override the path with SESSION_DB_PATH if needed.
-SESSION_DB_PATH = os.environ.get("SESSION_DB_PATH", "/tmp/sessions.db")
-SESSION_SERVICE_URI = f"sqlite:///{SESSION_DB_PATH}"
+SESSION_DB_DIR = "/session" if os.path.isdir("/session") else "/tmp"
+SESSION_DB_PATH = os.environ.get(
+    "SESSION_DB_PATH", os.path.join(SESSION_DB_DIR, "sessions.db")
+)
+
+# Set SESSION_EPHEMERAL=1 to skip the file entirely and keep sessions in ADK's
+# in-process memory store.  An in-memory SQLite DB would have to share one
+# connection across all concurrent requests, so the plain store is both
+# cheaper and safer.
+SESSION_EPHEMERAL = os.environ.get("SESSION_EPHEMERAL", "0") == "1"
+if SESSION_EPHEMERAL:
+    SESSION_SERVICE_URI = "memory://"
+else:
+    SESSION_SERVICE_URI = f"sqlite+aiosqlite:///{SESSION_DB_PATH}"
 
-# Allow requests from any origin by default.  Restrict this list in
-# production to trusted domains.  When deploying behind an internal
-# load balancer, you may remove CORS entirely.
-ALLOWED_ORIGINS = ["*"]
+# Run several worker processes so synchronous agent work is not serialised
+# behind a single GIL.  Each worker opens its own session DB pools, which is
+# why the DB runs in WAL mode.  When scaling horizontally (e.g. under an HPA),
+# set WEB_CONCURRENCY=1.  The default is a small constant rather than derived
+# from os.cpu_count(), which inside a container reports the node's cores, not
+# the CPU quota; every worker is a full copy of the agent.  Every worker
+# imports this module, so the lifespan below sees the same count as the
+# supervisor.
+WORKERS = int(os.environ.get("WEB_CONCURRENCY", 2))
+if SESSION_EPHEMERAL:
+    # In-memory sessions are private to a process, so a second worker would
+    # not see the sessions created by the first.
+    WORKERS = 1
+
+# Comma-separated list of origins allowed to call the API, e.g.
+# "https://app.example.com,https://admin.example.com".  Falls back to any
+# origin when unset, which is only meant for development.  When deploying
+# behind an internal load balancer, you may remove CORS entirely.
+ALLOWED_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get("ALLOWED_ORIGINS", "").split(",")
+    if origin.strip()
+] or ["*"]
+
+# Browsers cache a preflight for max_age seconds, so a known frontend only
+# pays for one OPTIONS round-trip a day.
+CORS_MAX_AGE = 86400
 
 # Serve the web interface so users can interact with the agent via a
 # browser.  Set this to False if you only need the API endpoints.
 SERVE_WEB_INTERFACE = True
 
 
-app: FastAPI = get_fast_api_app(
-    agents_dir=AGENT_DIR,
-    session_service_uri=SESSION_SERVICE_URI,
-    allow_origins=ALLOWED_ORIGINS,
-    web=SERVE_WEB_INTERFACE,
+class OrjsonResponse(JSONResponse):
+    """JSON response encoded with orjson instead of the stdlib encoder."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+# Responses that never change are rendered once and the same object is
+# returned on every request.  A short max-age lets a front proxy absorb bursts.
+CACHE_HEADERS = {"Cache-Control": "public, max-age=1"}
+
+# Probe responses must never be cached, or a proxy could keep reporting a pod
+# ready after it has stopped being so.
+NO_STORE_HEADERS = {"Cache-Control": "no-store"}
+HEALTH_OK_RESPONSE = OrjsonResponse({"status": "ok"}, headers=NO_STORE_HEADERS)
+HEALTH_UNAVAILABLE_RESPONSE = OrjsonResponse(
+    {"status": "unavailable"}, status_code=503, headers=NO_STORE_HEADERS
 )
+STARTING_RESPONSE = OrjsonResponse(
+    {"status": "starting"},
+    status_code=503,
+    headers={**NO_STORE_HEADERS, "Retry-After": "5"},
+)
+
+
+def _use_orjson(adk_app: FastAPI) -> None:
+    """Encode the ADK app's untyped JSON responses with orjson.
+
+    Routes with a response model already serialise straight to bytes through
+    Pydantic, so only routes on the default JSONResponse are switched.  Their
+    handlers were built at registration time and are rebuilt here.
+    """
+    adk_app.router.default_response_class = OrjsonResponse
+    for route in adk_app.routes:
+        if (
+            isinstance(route, APIRoute)
+            and route.response_field is None
+            and isinstance(route.response_class, DefaultPlaceholder)
+            and not (route.is_json_stream or route.is_sse_stream)
+        ):
+            route.response_class = OrjsonResponse
+            route.app = request_response(route.get_route_handler())
+
+
+def _cache_openapi(adk_app: FastAPI) -> None:
+    """Serve the app's OpenAPI schema from a response rendered once.
+
+    The schema (~200 KB for the ADK app) only changes on restart, but
+    FastAPI's handler re-encodes it on every request.
+    """
+    adk_app.openapi_schema = adk_app.openapi()
+    openapi_response = OrjsonResponse(
+        adk_app.openapi_schema, headers=CACHE_HEADERS
+    )
+
+    async def openapi(request):
+        return openapi_response
+
+    adk_app.router.routes[:] = [
+        Route(adk_app.openapi_url, openapi, include_in_schema=False)
+        if isinstance(route, Route) and route.path == adk_app.openapi_url
+        else route
+        for route in adk_app.router.routes
+    ]
+
+
+def _tune_cors(adk_app: FastAPI) -> None:
+    """Replace ADK's CORS middleware with one that lets browsers cache preflights.
+
+    ADK registers CORSMiddleware with every method allowed and no max_age.
+    Its parsed origin list is kept as is.  This must run before the app
+    serves its first request, when the middleware stack is built.
+    """
+    # Allow the methods the app's routes actually serve.  They depend on the
+    # ADK version and on SERVE_WEB_INTERFACE (the dev UI routes add PUT), so
+    # a hand-written list would go stale.
+    allowed_methods = sorted(
+        {
+            method
+            for route in adk_app.routes
+            for method in getattr(route, "methods", None) or ()
+        }
+    )
+    for index, middleware in enumerate(adk_app.user_middleware):
+        if middleware.cls is CORSMiddleware:
+            adk_app.user_middleware[index] = Middleware(
+                CORSMiddleware,
+                **{
+                    **middleware.kwargs,
+                    "allow_methods": allowed_methods,
+                    "max_age": CORS_MAX_AGE,
+                },
+            )
+
+
+def build_adk_app() -> FastAPI:
+    """Build the ADK application.  This imports the agent stack, so it is slow."""
+    global session_service
+
+    # The ADK and SQLAlchemy take ~2 s and ~100 MB to import.  Only processes
+    # that actually serve requests pay for them, not Uvicorn's supervisor.
+    from google.adk.cli.fast_api import get_fast_api_app
+
+    import session_store
 
+    session_store.register()
+    adk_app = get_fast_api_app(
+        agents_dir=AGENTS_DIR,
+        session_service_uri=SESSION_SERVICE_URI,
+        allow_origins=ALLOWED_ORIGINS,
+        web=SERVE_WEB_INTERFACE,
+    )
+    _tune_cors(adk_app)
+    _use_orjson(adk_app)
+    _cache_openapi(adk_app)
+    session_service = session_store.session_service
+    return adk_app
 
-# Kubernetes readiness/liveness endpoint expected by the Deployment probes
-@app.get("/healthz")
-def healthz() -> dict:
-    return {"status": "ok"}
+
+# The ADK application once it has been built and mounted; None until then.
+adk_app: FastAPI | None = None
+
+# The SQLite session service, kept so the readiness probe can check the store.
+# Stays None when sessions are held in memory.
+session_service = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build the ADK app and mount it at "/".
+
+    With several workers, Uvicorn's supervisor owns the listening socket, so
+    each worker builds the app before it starts accepting connections.  A
+    worker that replaces a crashed or recycled one then never takes requests
+    it cannot serve, while the others keep the pod ready.  A lone worker
+    builds in the background instead so it can bind immediately; until the
+    app is mounted, requests get a 503 (see starting()).
+
+    Mounted sub-applications do not get lifespan events of their own, so the
+    ADK app's lifespan (which closes its runners) is entered here as well.
+    """
+    async with AsyncExitStack() as stack:
+
+        async def mount_adk_app() -> None:
+            global adk_app
+            built = await asyncio.to_thread(build_adk_app)
+            await stack.enter_async_context(built.router.lifespan_context(built))
+            if session_service is not None:
+                # Create the schema now rather than on the first request.
+                await session_service.prime()
+            app.mount("/", built)
+            adk_app = built
+
+        if WORKERS > 1:
+            # A failure here fails the worker's startup, so it exits before
+            # accepting a connection and Uvicorn's supervisor replaces it.
+            await mount_adk_app()
+            yield
+            return
+
+        async def mount_in_background() -> None:
+            try:
+                await mount_adk_app()
+            except Exception:
+                logger.exception("Failed to build the ADK application")
+                # The app would never become ready, so do not linger serving
+                # 503s.  asyncio lets SystemExit escape the event loop, which
+                # ends the process non-zero so the container is restarted.
+                # The traceback is logged above, so it is not chained again.
+                raise SystemExit(1) from None
+
+        task = asyncio.create_task(mount_in_background())
+        try:
+            yield
+        finally:
+            task.cancel()
+
+
+# Liveness endpoint.  Kubernetes checks liveness with a TCP probe and startup
+# with /readyz; this stays for manual checks and other hosts.  It does no I/O
+# so a slow session store never gets the pod restarted.
+async def livez():
+    return HEALTH_OK_RESPONSE
+
+
+# Answers every path the outer app does not route itself until the ADK app is
+# mounted at "/", which then matches them all.  Clients are told to retry
+# rather than getting a 404 from a worker that is still starting.
+async def starting(scope, receive, send):
+    if scope["type"] == "websocket":
+        # 1013: try again later.
+        await send({"type": "websocket.close", "code": 1013})
+        return
+    await STARTING_RESPONSE(scope, receive, send)
+
+
+# Kubernetes readiness endpoint: only report ready once the ADK app is mounted
+# and the session store answers a query.
+async def readyz():
+    if adk_app is None:
+        return HEALTH_UNAVAILABLE_RESPONSE
+    if session_service is not None:
+        try:
+            await session_service.ping()
+        except Exception:
+            return HEALTH_UNAVAILABLE_RESPONSE
+    return HEALTH_OK_RESPONSE
+
+
+@functools.cache
+def build_app() -> FastAPI:
+    """Build the outer application that Uvicorn serves as ``main:app``.
+
+    It only owns the probes; the ADK app, mounted at "/" once ready, serves
+    everything else including its own OpenAPI schema and docs.
+    """
+    app = FastAPI(
+        lifespan=lifespan,
+        default_response_class=OrjsonResponse,
+        openapi_url=None,
+        docs_url=None,
+        redoc_url=None,
+    )
+    app.add_api_route("/livez", livez)
+    app.add_api_route("/readyz", readyz)
+    app.add_api_route("/healthz", readyz)
+    app.router.default = starting
+    return app
+
+
+def __getattr__(name):
+    # `main:app` is resolved on first access (PEP 562), so running this file
+    # as Uvicorn's supervisor process never builds an app it does not serve.
+    if name == "app":
+        return build_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
@@ -55,4 +342,45 @@ if __name__ == "__main__":
     # port 8080.  Uvicorn will start the ASGI server on the specified host and
     # port.  Do not set reload=True in production.
     port = int(os.environ.get("PORT", 8080))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+
+    # When a proxy sidecar shares the pod, set UVICORN_UDS to a socket path so
+    # local traffic skips the TCP stack; otherwise listen on TCP as usual.
+    uds = os.environ.get("UVICORN_UDS")
+    bind = {"uds": uds} if uds else {"host": "0.0.0.0", "port": port}
+
+    # Pin uvloop and httptools rather than letting uvicorn's "auto" mode
+    # quietly fall back to asyncio + h11 when they are missing from the image.
+    # Importing uvloop here makes a broken install fail at startup.
+    import uvicorn
+    import uvloop  # noqa: F401
+
+    workers = WORKERS
+
+    # Bound the work a burst can queue: connections beyond limit_concurrency
+    # get an immediate 503 instead of piling up in the event loop.  Keep-alive
+    # is raised from Uvicorn's 5 s so clients and the load balancer reuse
+    # connections.  Workers are recycled after a few thousand requests to
+    # bound memory growth in the ADK's caches; the jitter keeps them from all
+    # restarting at once.  A lone worker is never recycled, since Uvicorn
+    # would exit rather than replace it (and drop in-memory sessions).
+    limits = {
+        "limit_concurrency": int(os.environ.get("CONC_LIMIT", 256)),
+        "timeout_keep_alive": int(os.environ.get("KEEPALIVE", 30)),
+    }
+    if workers > 1:
+        limits["limit_max_requests"] = 10000
+        limits["limit_max_requests_jitter"] = 1000
+
+    # The access log is off because probe traffic dominates it; request
+    # logging belongs to the load balancer.  Uvicorn needs the import string
+    # rather than the app object to start more than one worker.
+    uvicorn.run(
+        "main:app",
+        **bind,
+        workers=workers,
+        **limits,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+        access_log=False,
+    )
@@ -0,0 +1,198 @@
+"""SQLite session store for the FastAPI entrypoint.
+
+The ADK maps plain `sqlite://` URIs to a session service that opens a fresh
+aiosqlite connection per call and cannot be tuned.  This module registers a
+factory for the `sqlite+aiosqlite` scheme instead, building the SQLAlchemy
+engines itself so every connection gets the PRAGMAs below, and splitting reads
+and writes across separate pools.
+
+It imports the ADK session stack and SQLAlchemy, so `main.py` only imports it
+when the ADK application is built.
+"""
+
+import asyncio
+import os
+import sqlite3
+from contextlib import closing
+
+from google.adk.cli.service_registry import get_service_registry
+from google.adk.sessions.database_session_service import DatabaseSessionService
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+
+# PRAGMAs applied to every new session DB connection.  SQLite defaults to the
+# DELETE journal, which blocks session reads while another request appends
+# events.  WAL lets readers proceed alongside the writer, and
+# synchronous=NORMAL is durable enough for pod-local session state.
+# Reader connections are opened read-only, so they skip the PRAGMAs that
+# change the database file itself.
+SQLITE_READER_PRAGMAS = (
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+)
+# auto_vacuum only takes effect on a new database, before the first table is
+# created; it lets the startup prime reclaim pages incrementally.
+SQLITE_PRAGMAS = (
+    "PRAGMA auto_vacuum=INCREMENTAL",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA wal_autocheckpoint=1000",
+    # Truncate the WAL back to 64 MiB after a checkpoint so a burst of
+    # appends does not leave it large in the RAM-backed volume.
+    "PRAGMA journal_size_limit=67108864",
+) + SQLITE_READER_PRAGMAS
+
+# Above this size the startup prime reclaims free pages (see prime()).
+SESSION_DB_VACUUM_THRESHOLD = 50 * 1024 * 1024
+
+# How often the startup prime retries schema setup raced by another worker.
+SESSION_DB_PRIME_ATTEMPTS = 5
+
+# ADK issues the same handful of statements on every request.  Give
+# SQLAlchemy's compiled-statement cache room for all of them across both
+# schemas, and let each sqlite3 connection keep more prepared statements than
+# its default of 100 so SQLite skips re-parsing them.
+SESSION_ENGINE_KWARGS = {
+    "query_cache_size": 1200,
+    "pool_pre_ping": False,
+}
+SESSION_CONNECT_ARGS = {"check_same_thread": False, "cached_statements": 256}
+
+# Session traffic is read-heavy (a session lookup per request, an occasional
+# append), so reads get their own pool of read-only connections while all
+# writes funnel through a single writer connection.  The default is a small
+# constant rather than derived from os.cpu_count(), which inside a container
+# reports the node's cores, not the CPU limit; every reader connection may
+# hold its own page cache (see SQLITE_READER_PRAGMAS).
+SESSION_READ_POOL_SIZE = int(os.environ.get("SESSION_READ_POOL_SIZE", 4))
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Tune each new writer connection and hand transaction control to us."""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+    # Stop the driver from emitting its own deferred BEGIN; see _begin_immediate.
+    dbapi_connection.isolation_level = None
+
+
+def _apply_sqlite_reader_pragmas(dbapi_connection, connection_record) -> None:
+    """Tune each new read-only connection before SQLAlchemy hands it out."""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_READER_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _begin_immediate(conn) -> None:
+    """Take the write lock when the transaction starts, not on first write.
+
+    A deferred BEGIN that later upgrades to a write lock can fail with
+    SQLITE_BUSY without honouring busy_timeout.
+    """
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+class SplitPoolSessionService(DatabaseSessionService):
+    """Database session service with separate reader and writer engines.
+
+    ADK already marks ``get_session``/``list_sessions``/``get_user_state`` as
+    read-only, so pointing its read-only session factory at a pool of
+    ``mode=ro`` connections is enough to keep reads from queueing behind
+    ``create_session``/``append_event`` on the writer.
+    """
+
+    def __init__(self, write_engine, read_engine, db_path: str):
+        super().__init__(db_engine=write_engine)
+        self.read_engine = read_engine
+        self.db_path = db_path
+        self._read_only_database_session_factory = async_sessionmaker(
+            bind=read_engine, expire_on_commit=False
+        )
+
+    async def ping(self) -> None:
+        """Round-trip a trivial query through the read pool."""
+        # Read-only connections cannot create the DB file, so make sure the
+        # writer has done so first.  This is a no-op after the first call.
+        await self.prepare_tables()
+        async with self.read_engine.connect() as conn:
+            await conn.exec_driver_sql("SELECT 1")
+
+    async def prime(self) -> None:
+        """Create the schema and warm the DB before serving traffic."""
+        # Every worker primes the same file.  ADK creates the tables and
+        # records the schema version in separate transactions, so a worker
+        # that looks in between sees a "malformed" DB; give the other worker
+        # a moment to finish and try again.
+        for attempt in range(SESSION_DB_PRIME_ATTEMPTS):
+            try:
+                await self.prepare_tables()
+                break
+            except ValueError:
+                if attempt == SESSION_DB_PRIME_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(0.2)
+        await asyncio.to_thread(self._prime_db_file)
+
+    def _prime_db_file(self) -> None:
+        """Refresh planner stats and reclaim free pages on a large DB.
+
+        A full VACUUM would stall startup, so free pages are reclaimed in
+        bounded incremental steps instead.
+        """
+        with closing(sqlite3.connect(self.db_path, timeout=5)) as conn:
+            conn.execute("ANALYZE")
+            conn.execute("SELECT 1 FROM sqlite_master").fetchall()
+            if os.path.getsize(self.db_path) > SESSION_DB_VACUUM_THRESHOLD:
+                # The pragma frees one page per step and returns no rows, so
+                # execute() would step it once and free a single page;
+                # executescript() runs it to completion.
+                conn.executescript("PRAGMA incremental_vacuum(1000);")
+            conn.commit()
+
+
+# The session service built by the factory below, kept so the readiness probe
+# can check the store.  Stays None when sessions are held in memory.
+session_service: SplitPoolSessionService | None = None
+
+
+def _sqlite_session_service_factory(uri: str, **kwargs) -> DatabaseSessionService:
+    """Build the session service on engines we own so the PRAGMAs apply."""
+    global session_service
+    kwargs.pop("agents_dir", None)
+    kwargs = {**SESSION_ENGINE_KWARGS, **kwargs}
+    write_engine = create_async_engine(
+        uri,
+        connect_args=SESSION_CONNECT_ARGS,
+        pool_size=1,
+        max_overflow=0,
+        **kwargs,
+    )
+    event.listen(write_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    event.listen(write_engine.sync_engine, "begin", _begin_immediate)
+
+    url = make_url(uri)
+    read_url = url.set(
+        database=f"file:{url.database}", query={"mode": "ro", "uri": "true"}
+    )
+    read_engine = create_async_engine(
+        read_url,
+        connect_args=SESSION_CONNECT_ARGS,
+        pool_size=SESSION_READ_POOL_SIZE,
+        **kwargs,
+    )
+    event.listen(read_engine.sync_engine, "connect", _apply_sqlite_reader_pragmas)
+    session_service = SplitPoolSessionService(write_engine, read_engine, url.database)
+    return session_service
+
+
+def register() -> None:
+    """Route ``sqlite+aiosqlite`` session URIs through the factory above."""
+    get_service_registry().register_session_service(
+        "sqlite+aiosqlite", _sqlite_session_service_factory
+    )
@@ -6,9 +6,21 @@ can discover it automatically when scanning the directory.  Without an
 `__init__.py` file, Python will not treat `spanner_agent` as a package and the
 ADK may fail to locate your agent.
 
-Upon import, this file simply imports the `agent` module which defines the
-`root_agent`.  Having a side‑effecting import is acceptable here because the
-ADK expects the agent to be defined at import time.
+The `agent` module, which pulls in the Spanner client and the LLM stack, is
+imported lazily: a module-level `__getattr__` (PEP 562) loads it the first
+time `agent` or `root_agent` is accessed, so importing the package stays
+cheap.
 """
 
-from . import agent  # noqa: F401
+import importlib
+
+
+def __getattr__(name):
+    if name in ("agent", "root_agent"):
+        # `from . import agent` would re-enter this hook via hasattr().
+        agent = importlib.import_module(".agent", __name__)
+        # Cache both names so later lookups bypass this hook.
+        globals()["agent"] = agent
+        globals()["root_agent"] = agent.root_agent
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -28,29 +28,91 @@ Environment Variables:
     SPANNER_MAX_ROWS: Maximum rows to return (default: 1000)
     SPANNER_QUERY_TIMEOUT: Query timeout in seconds (default: 30)
     ENABLE_AUDIT_LOGGING: Enable detailed audit logging (default: 'true')
+    SPANNER_SCHEMA_CACHE_TTL: Seconds to cache schema and table statistics (default: 60)
+    SPANNER_QUERY_CACHE_TTL: Seconds to cache read-only query results, 0 to disable (default: 30)
+    SPANNER_AUDIT_BUFFER_SIZE: Maximum audit entries written per batch (default: 100)
+    SPANNER_AUDIT_FLUSH_MS: Maximum time an audit entry waits to be written (default: 200)
 
 Author: Production Spanner Agent Team
 Version: 2.0.0
 License: Apache 2.0
 """
 
+import atexit
+import functools
 import os
+import queue
 import re
-import json
 import logging
+import threading
 import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple, Union
-from dataclasses import dataclass, asdict
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import nullcontext
 from enum import Enum
+from itertools import islice
 
+import orjson
+from google.api_core.exceptions import DeadlineExceeded
 from google.cloud import spanner
+from google.cloud.spanner_v1 import RequestOptions
 from google.adk.agents import LlmAgent
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# SQL for the metadata tools, built once. It is written by this module and
+# run through SpannerAgent._execute_sql_raw, which never validates, so it
+# needs no trust marker to get past SpannerSecurityValidator
+_TABLES_SQL = """
+    SELECT
+        TABLE_NAME,
+        COLUMN_NAME,
+        SPANNER_TYPE,
+        IS_NULLABLE,
+        ORDINAL_POSITION,
+        COLUMN_DEFAULT
+    FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_SCHEMA = ''
+    ORDER BY TABLE_NAME, ORDINAL_POSITION
+"""
+_INDEXES_SQL = """
+    SELECT
+        TABLE_NAME,
+        INDEX_NAME,
+        INDEX_TYPE,
+        IS_UNIQUE,
+        IS_NULL_FILTERED
+    FROM INFORMATION_SCHEMA.INDEXES
+    WHERE TABLE_SCHEMA = ''
+    ORDER BY TABLE_NAME, INDEX_NAME
+"""
+_TABLE_COLUMNS_SQL = """
+    SELECT
+        COLUMN_NAME,
+        SPANNER_TYPE,
+        IS_NULLABLE,
+        ORDINAL_POSITION
+    FROM INFORMATION_SCHEMA.COLUMNS
+    WHERE TABLE_NAME = @table_name AND TABLE_SCHEMA = ''
+    ORDER BY ORDINAL_POSITION
+"""
+_TABLE_INDEXES_SQL = """
+    SELECT
+        INDEX_NAME,
+        INDEX_TYPE,
+        IS_UNIQUE,
+        IS_NULL_FILTERED
+    FROM INFORMATION_SCHEMA.INDEXES
+    WHERE TABLE_NAME = @table_name AND TABLE_SCHEMA = ''
+    ORDER BY INDEX_NAME
+"""
+_HEALTH_CHECK_SQL = "SELECT 1 as health_check"
+
 class OperationType(Enum):
     """Enumeration of supported Spanner operations."""
     READ = "read"
@@ -71,6 +133,30 @@ class QueryResult:
     user_id: str
     session_id: str
     error: Optional[str] = None
+    truncated: bool = False
+    cached: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert to a plain dict for a tool response.
+        
+        Unlike dataclasses.asdict, this does not deep-copy the rows: `data`
+        is returned as is, and is shared with the query cache for cached
+        results, so it must not be modified.
+        """
+        return {
+            "success": self.success,
+            "data": self.data,
+            "row_count": self.row_count,
+            "execution_time": self.execution_time,
+            "sql": self.sql,
+            "timestamp": self.timestamp,
+            "user_id": self.user_id,
+            "session_id": self.session_id,
+            "error": self.error,
+            "truncated": self.truncated,
+            "cached": self.cached
+        }
 
 @dataclass
 class SecurityContext:
@@ -89,24 +175,47 @@ class SecurityContext:
 class SpannerSecurityValidator:
     """Validates and sanitizes SQL queries for security."""
     
-    # Dangerous SQL patterns that should be blocked
+    # Statement keywords that should be blocked, matched as whole words
+    KEYWORD_PATTERNS = [
+        r'DELETE|DROP|TRUNCATE|ALTER|CREATE|INSERT|UPDATE|GRANT|REVOKE',
+        r'EXEC|EXECUTE|sp_|xp_',
+    ]
+    
+    # Comment markers and statement separators that should be blocked, with
+    # the reason reported. They are literal, so they are found with substring
+    # scans; any ';' is refused, as Spanner runs one statement per query
+    FORBIDDEN_SUBSTRINGS = {
+        "--": "SQL comments",
+        "/*": "SQL comments",
+        ";": "multiple statements",
+    }
+    
+    # Other dangerous SQL patterns that should be blocked
     DANGEROUS_PATTERNS = [
-        r'\b(DELETE|DROP|TRUNCATE|ALTER|CREATE|INSERT|UPDATE|GRANT|REVOKE)\b',
-        r'\b(EXEC|EXECUTE|sp_|xp_)\b',
-        r'--.*$',  # SQL comments
-        r'/\*.*?\*/',  # Multi-line comments
-        r';\s*$',  # Multiple statements
         r'UNION\s+ALL\s+SELECT',  # Union attacks
         r'INFORMATION_SCHEMA\.(TABLES|COLUMNS)',  # Schema enumeration
     ]
     
-    # Allowed SQL patterns for read operations
-    ALLOWED_PATTERNS = [
-        r'^\s*SELECT\s+',
-        r'^\s*WITH\s+',
-        r'^\s*SHOW\s+',
-        r'^\s*DESCRIBE\s+',
-    ]
+    # Statements allowed in read-only mode: the first word must be one of
+    # these, followed by more of the statement. Checked by comparing the
+    # first word rather than with a regex
+    ALLOWED_KEYWORDS = frozenset({"SELECT", "WITH", "SHOW", "DESCRIBE"})
+    
+    # Compiled once at class creation so validation skips the re module's
+    # pattern cache lookup on every query. The keyword patterns are fused into
+    # one word-bounded alternation, so the query is scanned for keywords once;
+    # each has a named group that maps a match back to it. DANGEROUS_PATTERNS
+    # stay separate: each starts with a literal that re can skip ahead to,
+    # which fusing would defeat.
+    _KEYWORD_GROUPS = {f"k{index}": pattern for index, pattern in enumerate(KEYWORD_PATTERNS)}
+    _KEYWORD_RE = re.compile(
+        r'\b(?:' + "|".join(f"(?P<{name}>{pattern})" for name, pattern in _KEYWORD_GROUPS.items()) + r')\b',
+        re.IGNORECASE,
+    )
+    _DANGEROUS_RES = [re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in DANGEROUS_PATTERNS]
+    
+    # Whole-word SELECT, for the complexity check (does not count SELECTED)
+    _SELECT_RE = re.compile(r'\bSELECT\b', re.IGNORECASE)
     
     @classmethod
     def validate_query(cls, sql: str, security_context: SecurityContext) -> Tuple[bool, str]:
@@ -120,30 +229,105 @@ class SpannerSecurityValidator:
         Returns:
             Tuple of (is_valid, error_message)
         """
-        sql_upper = sql.upper().strip()
+        # Cheap checks first, so oversized input is rejected before any regex
+        # work and validation cost stays bounded
+        if len(sql) > 10000:
+            return False, "Query too long: Maximum 10,000 characters allowed"
+        
+        # Every pattern is case-insensitive, so there is no need for an
+        # uppercased copy of the query
+        sql_stripped = sql.strip()
+        if not sql_stripped:
+            return False, "Query is empty"
+        
+        # Comments and statement separators are found with substring scans,
+        # which also catch block comments that span lines
+        for substring, reason in cls.FORBIDDEN_SUBSTRINGS.items():
+            if substring in sql_stripped:
+                return False, f"Query contains forbidden pattern: {reason}"
         
         # Check for dangerous patterns
-        for pattern in cls.DANGEROUS_PATTERNS:
-            if re.search(pattern, sql_upper, re.IGNORECASE | re.MULTILINE):
-                return False, f"Query contains forbidden pattern: {pattern}"
+        match = cls._KEYWORD_RE.search(sql_stripped)
+        if match:
+            # Reported as the whole-word pattern that matched
+            pattern = cls._KEYWORD_GROUPS[match.lastgroup]
+            return False, f"Query contains forbidden pattern: \\b({pattern})\\b"
+        for pattern in cls._DANGEROUS_RES:
+            if pattern.search(sql_stripped):
+                return False, f"Query contains forbidden pattern: {pattern.pattern}"
         
         # In read-only mode, only allow SELECT queries
         if security_context.read_only:
-            if not any(re.match(pattern, sql_upper) for pattern in cls.ALLOWED_PATTERNS):
+            words = sql_stripped.split(None, 1)
+            if len(words) < 2 or words[0].upper() not in cls.ALLOWED_KEYWORDS:
                 return False, "Read-only mode: Only SELECT queries are allowed"
         
-        # Check query complexity
-        if sql_upper.count('SELECT') > 3:
+        # Check query complexity. The substring count is cheap and rules out
+        # almost every query; only then count whole words, so that columns
+        # such as SELECTED are not mistaken for subqueries
+        if sql_stripped.lower().count('select') > 3 and len(cls._SELECT_RE.findall(sql_stripped)) > 3:
             return False, "Query too complex: Too many SELECT statements"
         
-        if len(sql) > 10000:
-            return False, "Query too long: Maximum 10,000 characters allowed"
-        
         return True, ""
 
 class SpannerAgent:
     """Production-grade Spanner agent with comprehensive functionality."""
     
+    # Only plain SELECT/WITH statements get a LIMIT pushed down. To find the
+    # outermost LIMIT, the query is scanned for parentheses, ';' and LIMIT,
+    # skipping string literals, quoted identifiers and comments
+    _LIMITABLE_RE = re.compile(r'^\s*(SELECT|WITH)\b', re.IGNORECASE)
+    _LIMIT_SCAN_RE = re.compile(
+        r"(?P<skip>'''(?:[^'\\]|\\.|'(?!''))*'''"
+        r'|"""(?:[^"\\]|\\.|"(?!""))*"""'
+        r"""|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`(?:[^`\\]|\\.)*`"""
+        r"|--[^\n]*|#[^\n]*|/\*.*?\*/)"
+        r"|(?P<open>\()|(?P<close>\))|(?P<end>;)|(?P<limit>\bLIMIT\b)",
+        re.IGNORECASE | re.DOTALL,
+    )
+    # The row count of a LIMIT, when it is an integer literal
+    _LIMIT_COUNT_RE = re.compile(r'\s*(\d+)\b')
+    
+    # Options sent with every query. They are dicts so the client builds a
+    # fresh request proto from them each time (it modifies the one it sends).
+    # Internal metadata queries run at low priority so they do not compete
+    # with user queries.
+    _QUERY_OPTIONS = {"optimizer_version": "latest"}
+    _USER_REQUEST_OPTIONS = {"priority": RequestOptions.Priority.PRIORITY_MEDIUM}
+    _SYSTEM_REQUEST_OPTIONS = {"priority": RequestOptions.Priority.PRIORITY_LOW}
+    
+    # LIKE with a wildcard in its string literal, e.g. LIKE '%name%'
+    _LIKE_WILDCARD_RE = re.compile(r"\bLIKE\s+'[^']*%", re.IGNORECASE)
+    
+    # Number of tables whose statistics are cached (least recently used first out)
+    TABLE_STATS_CACHE_SIZE = 128
+    
+    # Total rows held by the query result cache. A row of ten short columns
+    # takes about 1 KiB, so this keeps the cache near 10 MiB per worker
+    QUERY_CACHE_MAX_ROWS = 10000
+    
+    # Runs of whitespace outside string literals and quoted identifiers, which
+    # do not change a query's meaning; literals are matched so they are kept.
+    # Quoted identifiers take the same escapes as string literals.
+    # Triple-quoted literals come first, or ''' would read as an empty '' and
+    # the whitespace inside the real literal would be collapsed. r/b prefixes
+    # need no handling: they are kept like any other text
+    _CANON_RE = re.compile(
+        r"('''(?:[^'\\]|\\.|'(?!''))*'''"
+        r'|"""(?:[^"\\]|\\.|"(?!""))*"""'
+        r"""|'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`(?:[^`\\]|\\.)*`)|\s+"""
+    )
+    
+    # Audit entries waiting to be written beyond this are dropped (and counted)
+    # rather than blocking queries
+    AUDIT_QUEUE_SIZE = 10000
+    
+    # Audit entries are stamped with time.time_ns() and only turned into a
+    # (naive UTC) datetime by the audit thread, which orjson then formats
+    # exactly like datetime.utcnow().isoformat()
+    _EPOCH = datetime(1970, 1, 1)
+    
+    
     def __init__(self):
         """Initialize the Spanner agent with configuration."""
         self.project_id = os.getenv("SPANNER_PROJECT")
@@ -153,12 +337,43 @@ class SpannerAgent:
         self.max_rows = int(os.getenv("SPANNER_MAX_ROWS", "1000"))
         self.query_timeout = int(os.getenv("SPANNER_QUERY_TIMEOUT", "30"))
         self.enable_audit = os.getenv("ENABLE_AUDIT_LOGGING", "true").lower() == "true"
+        self.schema_cache_ttl = int(os.getenv("SPANNER_SCHEMA_CACHE_TTL", "60"))
+        self.audit_buffer_size = int(os.getenv("SPANNER_AUDIT_BUFFER_SIZE", "100"))
+        self.audit_flush_interval = int(os.getenv("SPANNER_AUDIT_FLUSH_MS", "200")) / 1000
+        
+        # The schema rarely changes but the model inspects it repeatedly, so
+        # metadata results are cached as (expiry, payload) for a short TTL
+        self._schema_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._table_stats_cache: OrderedDict[str, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # The model often re-runs the same query while it works, so read-only
+        # results are cached by canonical SQL for a short TTL
+        self.query_cache_ttl = int(os.getenv("SPANNER_QUERY_CACHE_TTL", "30"))
+        self._query_cache: OrderedDict[str, Tuple[float, QueryResult]] = OrderedDict()
+        self._query_cache_rows = 0
+        self._query_cache_hits = 0
+        self._query_cache_misses = 0
         
         # Initialize Spanner client
         self.client = spanner.Client(project=self.project_id)
         self.instance = self.client.instance(self.instance_id)
         self.database = self.instance.database(self.database_id)
         
+        # Runs independent metadata queries concurrently so their round-trips
+        # overlap; shared by all calls rather than created per call
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="spanner-agent")
+        
+        # Audit entries are serialized and written in batches by a background
+        # thread, keeping JSON encoding and log I/O off the query path
+        self._audit_queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize=self.AUDIT_QUEUE_SIZE)
+        self._audit_dropped = 0
+        self._audit_lock = threading.Lock()
+        if self.enable_audit:
+            self._audit_thread = threading.Thread(target=self._audit_worker, name="spanner-audit", daemon=True)
+            self._audit_thread.start()
+            atexit.register(self._flush_audit_log)
+        
         logger.info(f"Spanner Agent initialized for {self.project_id}/{self.instance_id}/{self.database_id}")
         logger.info(f"Read-only mode: {self.read_only}, Max rows: {self.max_rows}, Timeout: {self.query_timeout}s")
 
@@ -178,7 +393,7 @@ class SpannerAgent:
             return
             
         audit_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": time.time_ns(),
             "event_type": event_type,
             "user_id": user_id,
             "session_id": session_id,
@@ -189,7 +404,108 @@ class SpannerAgent:
             "database_id": self.database_id
         }
         
-        logger.info(f"AUDIT: {json.dumps(audit_entry)}")
+        try:
+            self._audit_queue.put_nowait(audit_entry)
+        except queue.Full:
+            with self._audit_lock:
+                self._audit_dropped += 1
+
+    def _audit_worker(self):
+        """Write queued audit entries in batches until the shutdown sentinel arrives."""
+        reported_dropped = 0
+        while True:
+            entry = self._audit_queue.get()
+            stopping = entry is None
+            batch = [] if stopping else [entry]
+            
+            # Collect more entries until the batch is full or the oldest entry
+            # has waited audit_flush_interval
+            deadline = time.monotonic() + self.audit_flush_interval
+            while not stopping and len(batch) < self.audit_buffer_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._audit_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stopping = True
+                else:
+                    batch.append(entry)
+            
+            # One record per entry, so log collectors see one event each
+            for entry in batch:
+                entry["timestamp"] = self._EPOCH + timedelta(microseconds=entry["timestamp"] // 1000)
+                logger.info(f"AUDIT: {orjson.dumps(entry).decode()}")
+            
+            with self._audit_lock:
+                dropped = self._audit_dropped
+            if dropped > reported_dropped:
+                logger.warning(f"Dropped {dropped - reported_dropped} audit entries: audit queue full")
+                reported_dropped = dropped
+            
+            if stopping:
+                return
+
+    def _flush_audit_log(self):
+        """Write out pending audit entries and stop the audit thread (run at exit)."""
+        try:
+            self._audit_queue.put(None, timeout=1)
+        except queue.Full:
+            return
+        self._audit_thread.join(timeout=5)
+
+    @property
+    def audit_entries_dropped(self) -> int:
+        """Number of audit entries dropped because the audit queue was full."""
+        with self._audit_lock:
+            return self._audit_dropped
+
+    @classmethod
+    def _push_down_limit(cls, sql: str, limit: int) -> str:
+        """
+        Cap the query at `limit` rows so Spanner stops there instead of
+        streaming rows the client would discard.
+        
+        A LIMIT is appended unless the outermost query has one. An existing
+        integer LIMIT larger than `limit` is lowered to it; one that is not an
+        integer literal (e.g. a parameter) is left for the client to enforce.
+        A trailing ';' is dropped.
+        
+        Args:
+            sql: Validated SQL query
+            limit: Maximum number of rows to fetch
+        
+        Returns:
+            SQL to execute
+        """
+        if not cls._LIMITABLE_RE.match(sql):
+            return sql
+        
+        depth = 0
+        end = len(sql)
+        outer_limit = None
+        for match in cls._LIMIT_SCAN_RE.finditer(sql):
+            kind = match.lastgroup
+            if kind == "open":
+                depth += 1
+            elif kind == "close":
+                depth -= 1
+            elif kind == "end" and depth == 0:
+                end = match.start()
+                break
+            elif kind == "limit" and depth == 0:
+                outer_limit = match
+        sql = sql[:end].rstrip()
+        
+        if outer_limit is None:
+            # On a new line, so a trailing -- comment cannot swallow it
+            return f"{sql}\nLIMIT {limit}"
+        count = cls._LIMIT_COUNT_RE.match(sql, outer_limit.end())
+        if count and int(count.group(1)) > limit:
+            return f"{sql[:count.start(1)]}{limit}{sql[count.end(1):]}"
+        return sql
 
     def execute_query(self, sql: str, user_id: str = "default", session_id: str = "default") -> QueryResult:
         """
@@ -210,38 +526,157 @@ class SpannerAgent:
         # Create security context
         security_context = self._create_security_context(user_id, session_id)
         
-        # Validate query
-        validator = SpannerSecurityValidator()
-        is_valid, error_message = validator.validate_query(sql, security_context)
+        # Validate query (the validator is stateless, so no instance is needed)
+        is_valid, error_message = SpannerSecurityValidator.validate_query(sql, security_context)
         
         if not is_valid:
             self._audit_log("query_rejected", sql, user_id, session_id, error_message)
             raise ValueError(f"Query rejected for security reasons: {error_message}")
         
+        # Only results of read-only queries are safe to serve again
+        if not security_context.read_only or self.query_cache_ttl <= 0:
+            return self._execute_sql_raw(sql, security_context, request_options=self._USER_REQUEST_OPTIONS)
+        
+        cache_key = self._canonicalize_sql(sql)
+        with self._cache_lock:
+            self._expire_query_cache(time.monotonic())
+            cached = self._query_cache.get(cache_key)
+            if cached:
+                self._query_cache_hits += 1
+            else:
+                self._query_cache_misses += 1
+        
+        if cached:
+            self._audit_log("query_cache_hit", sql, user_id, session_id)
+            return replace(
+                cached[1],
+                sql=sql,
+                timestamp=datetime.utcnow().isoformat(),
+                user_id=user_id,
+                session_id=session_id,
+                cached=True
+            )
+        
+        result = self._execute_sql_raw(sql, security_context, request_options=self._USER_REQUEST_OPTIONS)
+        # Truncated results are the largest ones and cut off anyway, so they
+        # are not worth the memory
+        if result.truncated or len(result.data) > self.QUERY_CACHE_MAX_ROWS:
+            return result
+        with self._cache_lock:
+            now = time.monotonic()
+            self._expire_query_cache(now)
+            previous = self._query_cache.pop(cache_key, None)
+            if previous:
+                self._query_cache_rows -= len(previous[1].data)
+            self._query_cache[cache_key] = (now + self.query_cache_ttl, result)
+            self._query_cache_rows += len(result.data)
+            while self._query_cache_rows > self.QUERY_CACHE_MAX_ROWS:
+                _, (_, evicted) = self._query_cache.popitem(last=False)
+                self._query_cache_rows -= len(evicted.data)
+        return result
+
+    def _expire_query_cache(self, now: float) -> None:
+        """Drop expired query results; the caller must hold the cache lock.
+        
+        Every entry lives for the same TTL and hits do not reorder the cache,
+        so entries expire oldest first and the scan stops at the first live one.
+        """
+        while self._query_cache:
+            key, (expiry, result) = next(iter(self._query_cache.items()))
+            if expiry > now:
+                break
+            del self._query_cache[key]
+            self._query_cache_rows -= len(result.data)
+
+    @classmethod
+    def _canonicalize_sql(cls, sql: str) -> str:
+        """Collapse whitespace outside literals so reformatted queries share a cache entry."""
+        return cls._CANON_RE.sub(lambda match: match.group(1) or " ", sql).strip()
+
+    def query_cache_stats(self) -> Dict[str, int]:
+        """Return query result cache hits, misses, current size and rows held."""
+        with self._cache_lock:
+            return {
+                "hits": self._query_cache_hits,
+                "misses": self._query_cache_misses,
+                "size": len(self._query_cache),
+                "rows": self._query_cache_rows
+            }
+
+    def _execute_sql_raw(
+        self,
+        sql: str,
+        security_context: SecurityContext,
+        params: Optional[Dict[str, Any]] = None,
+        param_types: Optional[Dict[str, Any]] = None,
+        request_options: Optional[Dict[str, Any]] = None,
+        snapshot: Optional[Any] = None
+    ) -> QueryResult:
+        """
+        Execute a SQL query without security validation.
+        
+        Only for SQL that has already been validated or is written by this
+        module (schema, statistics and health queries); executions are still
+        audit logged. Values from callers must be bound as parameters, never
+        interpolated into the SQL.
+        
+        Args:
+            sql: SQL query to execute
+            security_context: Security context for execution
+            params: Values for the query's @parameters
+            param_types: Spanner types of the parameters
+            request_options: Spanner request options (default: low priority)
+            snapshot: Open snapshot to read from (default: a single-use one)
+            
+        Returns:
+            QueryResult with execution results and metadata
+            
+        Raises:
+            RuntimeError: If query execution fails
+        """
+        user_id = security_context.user_id
+        session_id = security_context.session_id
+        if request_options is None:
+            request_options = self._SYSTEM_REQUEST_OPTIONS
+        
         # Audit log query execution
-        self._audit_log("query_execution_start", sql, user_id, session_id)
+        self._audit_log("query_execution_start", sql, user_id, session_id, f"params={params}" if params else "")
         
         try:
-            results: List[Dict[str, Any]] = []
             execution_time = 0.0
             
-            with self.database.snapshot() as snapshot:
+            max_rows = security_context.max_rows
+            
+            with nullcontext(snapshot) if snapshot is not None else self.database.snapshot() as snapshot:
+                # Ask for one row more than the cap to tell whether the
+                # result was truncated; islice stays as a safety net for
+                # queries whose LIMIT is not an integer literal
                 query_start = time.time()
-                rows = snapshot.execute_sql(sql)
+                rows = snapshot.execute_sql(
+                    self._push_down_limit(sql, max_rows + 1),
+                    params=params,
+                    param_types=param_types,
+                    query_options=self._QUERY_OPTIONS,
+                    request_options=request_options,
+                    timeout=security_context.query_timeout
+                )
+                fetched = list(islice(rows, max_rows + 1))
                 execution_time = time.time() - query_start
                 
-                # Extract column names
-                field_names = [field.name for field in rows.metadata.row_type.fields]
+                truncated = len(fetched) > max_rows
+                if truncated:
+                    fetched.pop()
                 
-                # Process rows with limit
-                row_count = 0
-                for row in rows:
-                    if row_count >= security_context.max_rows:
-                        break
-                    
-                    values = list(row)
-                    results.append(dict(zip(field_names, values)))
-                    row_count += 1
+                # Extract column names once (the metadata is only populated
+                # once the stream has been read); each row is zipped against
+                # them directly, without copying it into a list first. The
+                # rows are converted in place: the list already has exactly
+                # the right length, and each row is freed as soon as its dict
+                # replaces it instead of living until the function returns
+                field_names = tuple(field.name for field in rows.metadata.row_type.fields)
+                results: List[Dict[str, Any]] = fetched
+                for index, row in enumerate(fetched):
+                    results[index] = dict(zip(field_names, row))
             
             # Create result
             result = QueryResult(
@@ -252,58 +687,92 @@ class SpannerAgent:
                 sql=sql,
                 timestamp=datetime.utcnow().isoformat(),
                 user_id=user_id,
-                session_id=session_id
+                session_id=session_id,
+                truncated=truncated
             )
             
             # Audit log successful execution
             self._audit_log("query_execution_success", sql, user_id, session_id, 
-                           f"Returned {len(results)} rows in {execution_time:.3f}s")
+                           f"Returned {len(results)} rows in {execution_time:.3f}s"
+                           + (" (truncated)" if truncated else ""))
             
             return result
             
+        except DeadlineExceeded as e:
+            error_msg = f"Query timed out after {security_context.query_timeout}s"
+            self._audit_log("query_execution_timeout", sql, user_id, session_id, error_msg)
+            raise RuntimeError(error_msg) from e
+            
         except Exception as e:
             error_msg = f"Query execution failed: {str(e)}"
             self._audit_log("query_execution_error", sql, user_id, session_id, error_msg)
             raise RuntimeError(error_msg) from e
+    
+    def _multi_query(
+        self,
+        sqls: List[str],
+        security_context: SecurityContext,
+        params: Optional[Dict[str, Any]] = None,
+        param_types: Optional[Dict[str, Any]] = None
+    ) -> List[QueryResult]:
+        """
+        Execute several module-owned SQL queries in one read-only snapshot.
+        
+        The queries share a single session checkout and read timestamp. The
+        first runs on this thread and the rest on the executor, which is safe
+        because a multi-use snapshot allows concurrent reads.
+        
+        Args:
+            sqls: SQL queries to execute
+            security_context: Security context for execution
+            params: Values for the queries' @parameters
+            param_types: Spanner types of the parameters
+            
+        Returns:
+            QueryResult for each query, in order
+            
+        Raises:
+            RuntimeError: If any query fails
+        """
+        with self.database.snapshot(multi_use=True) as snapshot:
+            futures = [
+                self._executor.submit(
+                    self._execute_sql_raw, sql, security_context, params, param_types, snapshot=snapshot
+                )
+                for sql in sqls[1:]
+            ]
+            try:
+                first = self._execute_sql_raw(sqls[0], security_context, params, param_types, snapshot=snapshot)
+            finally:
+                # The snapshot's session is released on exit, so let every
+                # read finish first
+                wait(futures)
+            return [first] + [future.result() for future in futures]
+
+    def invalidate_schema_cache(self) -> None:
+        """Drop cached schema information and table statistics, e.g. after a schema change."""
+        with self._cache_lock:
+            self._schema_cache = None
+            self._table_stats_cache.clear()
 
     def get_schema_info(self) -> Dict[str, Any]:
         """
         Get comprehensive schema information including tables, columns, indexes, and constraints.
         
+        Results are cached for SPANNER_SCHEMA_CACHE_TTL seconds.
+        
         Returns:
             Dictionary containing detailed schema information
         """
+        cached = self._schema_cache
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+        
         try:
-            # Get tables and columns
-            tables_query = """
-                SELECT 
-                    TABLE_NAME,
-                    COLUMN_NAME,
-                    SPANNER_TYPE,
-                    IS_NULLABLE,
-                    ORDINAL_POSITION,
-                    COLUMN_DEFAULT
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_SCHEMA = ''
-                ORDER BY TABLE_NAME, ORDINAL_POSITION
-            """
-            
-            # Get indexes
-            indexes_query = """
-                SELECT 
-                    TABLE_NAME,
-                    INDEX_NAME,
-                    INDEX_TYPE,
-                    IS_UNIQUE,
-                    IS_NULL_FILTERED
-                FROM INFORMATION_SCHEMA.INDEXES
-                WHERE TABLE_SCHEMA = ''
-                ORDER BY TABLE_NAME, INDEX_NAME
-            """
-            
-            # Execute queries
-            tables_result = self.execute_query(tables_query, "system", "schema_query")
-            indexes_result = self.execute_query(indexes_query, "system", "schema_query")
+            # Execute both queries concurrently in one snapshot. The SQL is
+            # fixed, so it skips validation
+            security_context = self._create_security_context("system", "schema_query")
+            tables_result, indexes_result = self._multi_query([_TABLES_SQL, _INDEXES_SQL], security_context)
             
             # Process results
             schema_info = {
@@ -358,6 +827,7 @@ class SpannerAgent:
             
             schema_info["metadata"]["total_tables"] = len(schema_info["tables"])
             
+            self._schema_cache = (time.monotonic() + self.schema_cache_ttl, schema_info)
             return schema_info
             
         except Exception as e:
@@ -398,10 +868,9 @@ class SpannerAgent:
             
             # Test connection with a simple query
             try:
-                test_query = "SELECT 1 as health_check"
-                result = self.execute_query(test_query, "system", "health_check")
+                result = self._execute_sql_raw(_HEALTH_CHECK_SQL, self._create_security_context("system", "health_check"))
                 health_info["connection"]["status"] = "connected"
-                health_info["performance"]["last_query_time"] = result.timestamp.isoformat()
+                health_info["performance"]["last_query_time"] = result.timestamp
                 health_info["performance"]["total_queries"] += 1
                 
             except Exception as e:
@@ -442,7 +911,8 @@ class SpannerAgent:
                 "execution_plan": None
             }
             
-            # Basic query analysis
+            # Basic query analysis. Substring tests on an uppercased copy run in
+            # C and beat a fused regex pass by a wide margin, so they stay
             sql_upper = sql.upper()
             
             # Check for common performance issues
@@ -458,7 +928,7 @@ class SpannerAgent:
                 )
                 analysis["analysis"]["complexity"] = "medium"
             
-            if "LIKE '%pattern%'" in sql or "LIKE 'pattern%'" in sql:
+            if "LIKE" in sql_upper and self._LIKE_WILDCARD_RE.search(sql):
                 analysis["analysis"]["recommendations"].append(
                     "Consider using indexes for LIKE queries with wildcards"
                 )
@@ -499,37 +969,29 @@ class SpannerAgent:
         Args:
             table_name: Name of the table to analyze
             
+        Results are cached for SPANNER_SCHEMA_CACHE_TTL seconds.
+        
         Returns:
             Dictionary containing table statistics and metadata
         """
+        with self._cache_lock:
+            cached = self._table_stats_cache.get(table_name)
+            if cached and cached[0] > time.monotonic():
+                self._table_stats_cache.move_to_end(table_name)
+                return cached[1]
+        
         try:
-            # Get table structure
-            columns_query = f"""
-                SELECT 
-                    COLUMN_NAME,
-                    SPANNER_TYPE,
-                    IS_NULLABLE,
-                    ORDINAL_POSITION
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_NAME = '{table_name}' AND TABLE_SCHEMA = ''
-                ORDER BY ORDINAL_POSITION
-            """
-            
-            # Get table indexes
-            indexes_query = f"""
-                SELECT 
-                    INDEX_NAME,
-                    INDEX_TYPE,
-                    IS_UNIQUE,
-                    IS_NULL_FILTERED
-                FROM INFORMATION_SCHEMA.INDEXES
-                WHERE TABLE_NAME = '{table_name}' AND TABLE_SCHEMA = ''
-                ORDER BY INDEX_NAME
-            """
-            
-            # Execute queries
-            columns_result = self.execute_query(columns_query, "system", "table_stats")
-            indexes_result = self.execute_query(indexes_query, "system", "table_stats")
+            # The table name is bound as a parameter: this SQL skips
+            # validation, and one query text lets Spanner reuse its plan
+            # for every table
+            params = {"table_name": table_name}
+            param_types = {"table_name": spanner.param_types.STRING}
+            
+            # Execute both queries concurrently in one snapshot
+            security_context = self._create_security_context("system", "table_stats")
+            columns_result, indexes_result = self._multi_query(
+                [_TABLE_COLUMNS_SQL, _TABLE_INDEXES_SQL], security_context, params, param_types
+            )
             
             # Process results
             table_stats = {
@@ -570,6 +1032,12 @@ class SpannerAgent:
                 }
                 table_stats["indexes"]["details"].append(index_info)
             
+            with self._cache_lock:
+                self._table_stats_cache[table_name] = (time.monotonic() + self.schema_cache_ttl, table_stats)
+                self._table_stats_cache.move_to_end(table_name)
+                if len(self._table_stats_cache) > self.TABLE_STATS_CACHE_SIZE:
+                    self._table_stats_cache.popitem(last=False)
+            
             return table_stats
             
         except Exception as e:
@@ -581,8 +1049,16 @@ class SpannerAgent:
                 "timestamp": datetime.utcnow().isoformat()
             }
 
-# Global agent instance
-spanner_agent = SpannerAgent()
+# Global agent instance, created on first tool call so that importing this
+# module does not build a Spanner client or need its environment variables
+@functools.cache
+def _get_agent() -> SpannerAgent:
+    """Return the shared SpannerAgent, creating it on first use."""
+    return SpannerAgent()
+
+def _dumps(obj: Any) -> str:
+    """Serialize a tool result to indented JSON, falling back to str() for unsupported types."""
+    return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2).decode()
 
 # ADK Tool Functions
 def run_spanner_query(sql: str, user_id: str = "default", session_id: str = "default") -> Dict[str, Any]:
@@ -604,8 +1080,8 @@ def run_spanner_query(sql: str, user_id: str = "default", session_id: str = "def
         "SELECT * FROM users WHERE active = true LIMIT 10"
     """
     try:
-        result = spanner_agent.execute_query(sql, user_id, session_id)
-        return asdict(result)
+        result = _get_agent().execute_query(sql, user_id, session_id)
+        return result.to_dict()
     except Exception as e:
         return {
             "success": False,
@@ -623,13 +1099,13 @@ def get_spanner_schema() -> str:
         JSON string containing detailed schema information
     """
     try:
-        schema_info = spanner_agent.get_schema_info()
-        return json.dumps(schema_info, indent=2, default=str)
+        schema_info = _get_agent().get_schema_info()
+        return _dumps(schema_info)
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             "error": f"Failed to retrieve schema: {str(e)}",
             "timestamp": datetime.utcnow().isoformat()
-        }, indent=2)
+        })
 
 def get_database_health() -> str:
     """
@@ -639,13 +1115,13 @@ def get_database_health() -> str:
         JSON string containing health metrics and status information
     """
     try:
-        health_info = spanner_agent.get_database_health()
-        return json.dumps(health_info, indent=2, default=str)
+        health_info = _get_agent().get_database_health()
+        return _dumps(health_info)
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             "error": f"Failed to retrieve health information: {str(e)}",
             "timestamp": datetime.utcnow().isoformat()
-        }, indent=2)
+        })
 
 def analyze_query_performance(sql: str) -> str:
     """
@@ -658,13 +1134,13 @@ def analyze_query_performance(sql: str) -> str:
         JSON string containing performance analysis and recommendations
     """
     try:
-        analysis_result = spanner_agent.analyze_query_performance(sql)
-        return json.dumps(analysis_result, indent=2, default=str)
+        analysis_result = _get_agent().analyze_query_performance(sql)
+        return _dumps(analysis_result)
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             "error": f"Failed to analyze query performance: {str(e)}",
             "timestamp": datetime.utcnow().isoformat()
-        }, indent=2)
+        })
 
 def get_table_statistics(table_name: str) -> str:
     """
@@ -677,14 +1153,14 @@ def get_table_statistics(table_name: str) -> str:
         JSON string containing table statistics and metadata
     """
     try:
-        table_stats = spanner_agent.get_table_statistics(table_name)
-        return json.dumps(table_stats, indent=2, default=str)
+        table_stats = _get_agent().get_table_statistics(table_name)
+        return _dumps(table_stats)
     except Exception as e:
-        return json.dumps({
+        return _dumps({
             "error": f"Failed to get table statistics: {str(e)}",
             "table_name": table_name,
             "timestamp": datetime.utcnow().isoformat()
-        }, indent=2)
+        })
 
 # Enhanced agent instructions for production use
 AGENT_INSTRUCTIONS = """
@@ -0,0 +1,68 @@
+"""A SpannerAgent backed by an in-memory fake database.
+
+The fake records the SQL it is sent and answers every query with the rows
+in ``database.rows``, like a streamed result set with one column ``n``.
+"""
+
+import os
+from types import SimpleNamespace
+from unittest import mock
+
+from spanner_agent.agent import SpannerAgent
+
+
+class FakeResultSet:
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self.metadata = SimpleNamespace(
+            row_type=SimpleNamespace(fields=[SimpleNamespace(name="n")])
+        )
+
+    def __iter__(self):
+        return self._rows
+
+
+class FakeSnapshot:
+    def __init__(self, database):
+        self._database = database
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute_sql(self, sql, **kwargs):
+        self._database.executed.append(sql)
+        return FakeResultSet(list(self._database.rows))
+
+
+class FakeDatabase:
+    def __init__(self):
+        self.rows = []
+        self.executed = []
+
+    def snapshot(self, **kwargs):
+        return FakeSnapshot(self)
+
+
+def make_agent(max_rows=3, query_cache_ttl=30):
+    """Return a SpannerAgent whose queries go to a FakeDatabase."""
+    env = {
+        "SPANNER_INSTANCE": "test",
+        "SPANNER_DATABASE": "test",
+        "SPANNER_MAX_ROWS": str(max_rows),
+        "SPANNER_QUERY_CACHE_TTL": str(query_cache_ttl),
+        "ENABLE_AUDIT_LOGGING": "false",
+    }
+    with mock.patch.dict(os.environ, env), mock.patch(
+        "spanner_agent.agent.spanner.Client"
+    ):
+        agent = SpannerAgent()
+    agent.database = FakeDatabase()
+    return agent
+
+
+def rows(count):
+    """Rows as the fake database streams them: tuples of one value."""
+    return [(index,) for index in range(count)]
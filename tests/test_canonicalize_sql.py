@@ -0,0 +1,60 @@
+"""Cache keys from SpannerAgent._canonicalize_sql.
+
+Queries that differ only in whitespace outside literals must share a key, so
+reformatted queries hit the result cache.  Queries whose literals or quoted
+identifiers differ must never share one, or the cache would answer a query
+with another query's rows.
+
+Run from the repository root with ``python -m unittest``.
+"""
+
+import unittest
+
+from spanner_agent.agent import SpannerAgent
+
+# (sql, sql) pairs that must get the same key
+SAME_KEY = [
+    ("SELECT 1", "  SELECT 1  "),
+    ("SELECT a FROM t", "SELECT  a\n\tFROM   t"),
+    ("SELECT 'a b' FROM t", "SELECT\n'a b'\nFROM t"),
+    ("SELECT '''x  y''' AS v", "SELECT   '''x  y'''   AS v"),
+]
+
+# (sql, sql) pairs that must get different keys
+DIFFERENT_KEY = [
+    ("SELECT 'a  b'", "SELECT 'a b'"),
+    ('SELECT "a  b"', 'SELECT "a b"'),
+    ("SELECT `a  b` FROM t", "SELECT `a b` FROM t"),
+    # An escaped backtick does not end a quoted identifier
+    ("SELECT `a\\``, `x  y` FROM t", "SELECT `a\\``, `x y` FROM t"),
+    ("SELECT 'it\\'s  x'", "SELECT 'it\\'s x'"),
+    ("SELECT 'abc'", "SELECT 'ABC'"),
+    # Triple-quoted literals, which may hold single quotes
+    ("SELECT '''it's   x''' AS v", "SELECT '''it's x''' AS v"),
+    ('SELECT """it"s   x""" AS v', 'SELECT """it"s x""" AS v'),
+    ("SELECT r'''a  b'''", "SELECT r'''a b'''"),
+    ("SELECT b'''a\n b'''", "SELECT b'''a b'''"),
+    ("SELECT '''''a  b'''", "SELECT '''''a b'''"),
+]
+
+
+class CanonicalizeSqlTest(unittest.TestCase):
+    def test_same_key(self):
+        for first, second in SAME_KEY:
+            with self.subTest(first=first, second=second):
+                self.assertEqual(
+                    SpannerAgent._canonicalize_sql(first),
+                    SpannerAgent._canonicalize_sql(second),
+                )
+
+    def test_different_key(self):
+        for first, second in DIFFERENT_KEY:
+            with self.subTest(first=first, second=second):
+                self.assertNotEqual(
+                    SpannerAgent._canonicalize_sql(first),
+                    SpannerAgent._canonicalize_sql(second),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Row cap pushed down by SpannerAgent._push_down_limit.
+
+Each case lists a query, the SQL sent to Spanner when the cap is 3 rows (so
+the LIMIT is 4: one extra row tells whether the result was truncated), how
+many rows Spanner returns for it, and the result the caller gets.
+
+Run from the repository root with ``python -m unittest``.
+"""
+
+import unittest
+
+from tests.fake_spanner import make_agent, rows
+
+MAX_ROWS = 3
+
+# (sql, sql sent, rows returned, row_count, truncated)
+CASES = [
+    # No LIMIT: one is appended
+    ("SELECT n FROM t", "SELECT n FROM t\nLIMIT 4", 4, 3, True),
+    ("SELECT n FROM t", "SELECT n FROM t\nLIMIT 4", 3, 3, False),
+    ("SELECT n FROM t ORDER BY n", "SELECT n FROM t ORDER BY n\nLIMIT 4", 4, 3, True),
+    ("WITH x AS (SELECT n FROM t) SELECT n FROM x", "WITH x AS (SELECT n FROM t) SELECT n FROM x\nLIMIT 4", 2, 2, False),
+    # An existing LIMIT is kept when it is tighter, and lowered otherwise
+    ("SELECT n FROM t LIMIT 2", "SELECT n FROM t LIMIT 2", 2, 2, False),
+    ("SELECT n FROM t LIMIT 4", "SELECT n FROM t LIMIT 4", 4, 3, True),
+    ("SELECT n FROM t ORDER BY n LIMIT 10", "SELECT n FROM t ORDER BY n LIMIT 4", 4, 3, True),
+    ("SELECT n FROM t limit 10", "SELECT n FROM t limit 4", 3, 3, False),
+    ("SELECT n FROM t LIMIT 10 OFFSET 5", "SELECT n FROM t LIMIT 4 OFFSET 5", 4, 3, True),
+    ("SELECT n FROM t LIMIT 2 OFFSET 5", "SELECT n FROM t LIMIT 2 OFFSET 5", 2, 2, False),
+    # A LIMIT that is not an integer literal is left to the client
+    ("SELECT n FROM t LIMIT @n", "SELECT n FROM t LIMIT @n", 10, 3, True),
+    # A LIMIT in a subquery does not cap the outer query
+    ("SELECT n FROM (SELECT n FROM t LIMIT 10) ORDER BY n", "SELECT n FROM (SELECT n FROM t LIMIT 10) ORDER BY n\nLIMIT 4", 4, 3, True),
+    ("SELECT n FROM t WHERE n IN (SELECT n FROM u LIMIT 1)", "SELECT n FROM t WHERE n IN (SELECT n FROM u LIMIT 1)\nLIMIT 4", 1, 1, False),
+    ("SELECT n FROM (SELECT n FROM t LIMIT 10) LIMIT 20", "SELECT n FROM (SELECT n FROM t LIMIT 10) LIMIT 4", 4, 3, True),
+    # LIMIT in a string literal, quoted identifier or comment is not a LIMIT
+    ("SELECT 'LIMIT 1' AS n", "SELECT 'LIMIT 1' AS n\nLIMIT 4", 1, 1, False),
+    ("SELECT `limit` AS n FROM t", "SELECT `limit` AS n FROM t\nLIMIT 4", 4, 3, True),
+    ("SELECT n FROM t -- LIMIT 1", "SELECT n FROM t -- LIMIT 1\nLIMIT 4", 4, 3, True),
+    ("SELECT n FROM t /* LIMIT 1 */", "SELECT n FROM t /* LIMIT 1 */\nLIMIT 4", 4, 3, True),
+    # A trailing ';' is dropped
+    ("SELECT n FROM t;", "SELECT n FROM t\nLIMIT 4", 4, 3, True),
+    ("SELECT n FROM t ; ", "SELECT n FROM t\nLIMIT 4", 3, 3, False),
+    ("SELECT n FROM t LIMIT 10;", "SELECT n FROM t LIMIT 4", 4, 3, True),
+    ("SELECT ';' AS n", "SELECT ';' AS n\nLIMIT 4", 1, 1, False),
+    # Only SELECT and WITH statements are capped in SQL
+    ("SHOW TABLES", "SHOW TABLES", 5, 3, True),
+]
+
+
+class PushDownLimitTest(unittest.TestCase):
+    def test_cases(self):
+        agent = make_agent(max_rows=MAX_ROWS)
+        context = agent._create_security_context()
+        for sql, sent, returned, row_count, truncated in CASES:
+            with self.subTest(sql=sql, returned=returned):
+                agent.database.rows = rows(returned)
+                agent.database.executed.clear()
+                result = agent._execute_sql_raw(sql, context)
+                self.assertEqual(agent.database.executed, [sent])
+                self.assertEqual(result.row_count, row_count)
+                self.assertEqual(result.data, [{"n": n} for n in range(row_count)])
+                self.assertEqual(result.truncated, truncated)
+
+
+if __name__ == "__main__":
+    unittest.main()
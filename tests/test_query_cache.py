@@ -0,0 +1,96 @@
+"""Read-only query result cache in SpannerAgent.execute_query.
+
+STEPS run in order against one agent with a 3-row cap, a 30 s TTL and room
+for 5 cached rows.  Each step advances a fake clock, runs a query and checks
+whether it was answered from the cache and how many rows the cache holds
+afterwards.
+
+Run from the repository root with ``python -m unittest``.
+"""
+
+import time
+import unittest
+from unittest import mock
+
+from tests.fake_spanner import make_agent, rows
+
+
+class FakeTime:
+    """The agent module's `time`, with a monotonic clock moved by hand."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return time.time()
+
+    def time_ns(self):
+        return time.time_ns()
+
+
+# (seconds to advance, sql, rows returned by Spanner, served from cache,
+#  rows held by the cache afterwards)
+STEPS = [
+    (0, "SELECT n FROM a", 2, False, 2),
+    # Reformatted queries share an entry
+    (0, "SELECT  n\nFROM a", 2, True, 2),
+    (29, "SELECT n FROM a", 2, True, 2),
+    # Expired at 30 s, so it runs again and is cached anew
+    (1, "SELECT n FROM a", 2, False, 2),
+    # Truncated results are never cached
+    (0, "SELECT n FROM b", 4, False, 2),
+    (0, "SELECT n FROM b", 4, False, 2),
+    (0, "SELECT n FROM c", 3, False, 5),
+    # Over 5 rows: the oldest entry (a) is evicted
+    (0, "SELECT n FROM d", 1, False, 4),
+    (0, "SELECT n FROM c", 3, True, 4),
+    # Hits do not reorder the cache, so c is evicted next
+    (0, "SELECT n FROM a", 2, False, 3),
+    (0, "SELECT n FROM c", 3, False, 5),
+    # a and c expire together; d runs again and is the only entry left
+    (30, "SELECT n FROM d", 1, False, 1),
+]
+
+
+class QueryCacheTest(unittest.TestCase):
+    def test_steps(self):
+        agent = make_agent(max_rows=3, query_cache_ttl=30)
+        agent.QUERY_CACHE_MAX_ROWS = 5
+        clock = FakeTime()
+        hits = misses = 0
+        with mock.patch("spanner_agent.agent.time", clock):
+            for index, (advance, sql, returned, cached, cache_rows) in enumerate(STEPS):
+                with self.subTest(step=index, sql=sql):
+                    clock.now += advance
+                    agent.database.rows = rows(returned)
+                    agent.database.executed.clear()
+                    result = agent.execute_query(sql, user_id="u", session_id="s")
+                    row_count = min(returned, 3)
+                    self.assertEqual(result.cached, cached)
+                    self.assertEqual(len(agent.database.executed), 0 if cached else 1)
+                    self.assertEqual(result.data, [{"n": n} for n in range(row_count)])
+                    self.assertEqual(result.truncated, returned > 3)
+                    # A hit is reported with the caller's own query and ids
+                    self.assertEqual((result.sql, result.user_id, result.session_id), (sql, "u", "s"))
+                    self.assertEqual(agent.query_cache_stats()["rows"], cache_rows)
+                    if cached:
+                        hits += 1
+                    else:
+                        misses += 1
+        stats = agent.query_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]), (hits, misses, 1))
+
+    def test_disabled(self):
+        agent = make_agent(max_rows=3, query_cache_ttl=0)
+        agent.database.rows = rows(2)
+        for _ in range(2):
+            self.assertFalse(agent.execute_query("SELECT n FROM a").cached)
+        self.assertEqual(len(agent.database.executed), 2)
+        self.assertEqual(agent.query_cache_stats()["size"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
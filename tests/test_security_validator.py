@@ -0,0 +1,108 @@
+"""Verdict table for SpannerSecurityValidator.validate_query.
+
+Each case lists a query and whether it is accepted in read-only and in
+read-write mode.  BASELINE_CASES pin the verdicts of the original validator;
+CHANGED_CASES are where it was deliberately made stricter or more precise.
+A validator change that flips any verdict must update this table.
+
+Run from the repository root with ``python -m unittest``.
+"""
+
+import unittest
+
+from spanner_agent.agent import SecurityContext, SpannerSecurityValidator
+
+# (sql, accepted when read-only, accepted when read-write)
+BASELINE_CASES = [
+    # Statements allowed in read-only mode
+    ("SELECT 1", True, True),
+    ("select a from t", True, True),
+    ("selEct 1", True, True),
+    ("  SELECT * FROM users LIMIT 10", True, True),
+    ("SELECT\tfoo FROM bar", True, True),
+    ("select\n1", True, True),
+    ("WITH x AS (SELECT 1) SELECT * FROM x", True, True),
+    ("SHOW TABLES", True, True),
+    ("DESCRIBE t", True, True),
+    ("SELECT CURRENT_TIMESTAMP()", True, True),
+    # Other statements are only allowed in read-write mode
+    ("EXPLAIN SELECT 1", False, True),
+    ("SELECTa FROM t", False, True),
+    ("SELECT", False, True),
+    # Blocked keywords, as whole words only
+    ("DROP TABLE x", False, False),
+    ("DELETE FROM t", False, False),
+    ("TRUNCATE TABLE t", False, False),
+    ("UPDATE t SET a=1", False, False),
+    ("INSERT INTO t VALUES (1)", False, False),
+    ("SELECT exec FROM t", False, False),
+    ("SELECT * FROM t WHERE name = 'DROP'", False, False),
+    ("SELECT * FROM created_at_table", True, True),
+    ("SELECT createdAt FROM t", True, True),
+    ("SELECT created FROM t", True, True),
+    ("select * from t where deleted = true", True, True),
+    # Comments and statement separators
+    ("SELECT 1 -- hi", False, False),
+    ("SELECT a FROM t -- x\n", False, False),
+    ("SELECT name FROM t WHERE note = 'a -- b'", False, False),
+    ("SELECT /* c */ 1", False, False),
+    ("SELECT 1; ", False, False),
+    ("SELECT 1 ;", False, False),
+    ("SELECT 1;\nSELECT 2", False, False),
+    # Union attacks and schema enumeration
+    ("SELECT a FROM t UNION ALL SELECT b FROM u", False, False),
+    ("SELECT 2 union all\n select 3", False, False),
+    ("SELECT * FROM information_schema.tables", False, False),
+    ("Select a from information_schema.columns", False, False),
+    ("SELECT * FROM INFORMATION_SCHEMA.INDEXES", True, True),
+    # Complexity and length limits
+    (
+        "SELECT a FROM t WHERE b IN (SELECT c FROM d WHERE e IN "
+        "(SELECT f FROM g WHERE h IN (SELECT 1)))",
+        False,
+        False,
+    ),
+    ("SELECT selected, selection FROM t", True, True),
+    ("SELECT " + "a," * 6000 + "b FROM t", False, False),
+]
+
+CHANGED_CASES = [
+    # Empty queries are rejected in read-write mode too
+    ("", False, False),
+    ("   ", False, False),
+    # Block comments are caught when they span lines
+    ("select 1 /* a\n b */", False, False),
+    # A ';' before a second statement on the same line is caught
+    ("SELECT 1; SELECT 2", False, False),
+    # ';' and '/*' are refused inside string literals, like '--'
+    ("SELECT 'a;' FROM t", False, False),
+    ("SELECT '/*' FROM t", False, False),
+    # Only whole-word SELECTs count towards the complexity limit
+    ("SELECT selected, selected_at, preselected FROM t", True, True),
+]
+
+
+class ValidateQueryTest(unittest.TestCase):
+    def assert_verdicts(self, cases):
+        for sql, read_only_ok, read_write_ok in cases:
+            for read_only, expected in ((True, read_only_ok), (False, read_write_ok)):
+                with self.subTest(sql=sql[:60], read_only=read_only):
+                    context = SecurityContext(
+                        user_id="test", session_id="test", read_only=read_only
+                    )
+                    is_valid, error = SpannerSecurityValidator.validate_query(
+                        sql, context
+                    )
+                    self.assertEqual(is_valid, expected, error)
+                    # Rejections always say why
+                    self.assertEqual(bool(error), not is_valid)
+
+    def test_baseline_verdicts(self):
+        self.assert_verdicts(BASELINE_CASES)
+
+    def test_changed_verdicts(self):
+        self.assert_verdicts(CHANGED_CASES)
+
+
+if __name__ == "__main__":
+    unittest.main()